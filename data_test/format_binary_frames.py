@@ -4,30 +4,38 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import struct
 import sys
 from pathlib import Path
-from typing import Any, Iterable, Optional, Sequence
+from typing import Iterable, Optional, Sequence, TextIO
+
+import numpy as np
 
 HEADER_STRUCT = struct.Struct("<4sHHII")
 HEADER_MAGIC = b"RADR"
 SUPPORTED_VERSION = 1
 SUPPORTED_SAMPLE_SIZES = {1: "B", 2: "H", 4: "I"}
+OUTPUT_BUFFER_SIZE = 1 << 20
+SAMPLE_DTYPES = {
+    (size, signed): np.dtype(f"<{'i' if signed else 'u'}{size}")
+    for size in SUPPORTED_SAMPLE_SIZES
+    for signed in (False, True)
+}
+CSV_HEADER = ("frame", "chirp", "sample", "rx", "value")
+CSV_NEWLINE = "\r\n"  # matches csv.writer's default line terminator
+CSV_FLUSH_ROWS = 4096
 
 
 class FrameDecodeError(RuntimeError):
     """Raised when a captured log cannot be decoded."""
 
 
-def _read_exact(stream, size: int) -> bytes:
-    data = stream.read(size)
-    if len(data) != size:
+def _read_exact_into(stream, view: memoryview) -> None:
+    if stream.readinto(view) != len(view):
         raise FrameDecodeError("Unexpected end of file while reading frame data")
-    return data
 
 
-def _unpack_samples(payload: bytes, sample_size: int, sample_count: int, signed: bool) -> Sequence[int]:
+def _unpack_samples(payload: memoryview, sample_size: int, sample_count: int, signed: bool) -> np.ndarray:
     expected = sample_size * sample_count
     if len(payload) != expected:
         raise FrameDecodeError(
@@ -37,67 +45,116 @@ def _unpack_samples(payload: bytes, sample_size: int, sample_count: int, signed:
     if sample_size not in SUPPORTED_SAMPLE_SIZES:
         raise FrameDecodeError(f"Unsupported sample size: {sample_size} bytes")
 
-    type_char = SUPPORTED_SAMPLE_SIZES[sample_size]
-    if signed:
-        type_char = type_char.lower()
+    # Zero-copy view over the payload; consumers only index and slice it.
+    return np.frombuffer(payload, dtype=SAMPLE_DTYPES[(sample_size, signed)])
+
 
-    return struct.unpack(f"<{sample_count}{type_char}", payload)
+def _format_linear_dump(samples: np.ndarray) -> str:
+    lines = [f"  Sample {idx:05d}: {value}\n" for idx, value in enumerate(samples.tolist())]
+    lines.append("\n")
+    return "".join(lines)
 
 
 def _write_frame_text(
     handle,
     *,
     frame_index: int,
-    samples: Sequence[int],
+    samples: np.ndarray,
     rx_antennas: int,
     samples_per_chirp: int,
 ) -> None:
     sample_count = len(samples)
-    handle.write(f"Frame {frame_index} ({sample_count} samples)\n")
+    header = f"Frame {frame_index} ({sample_count} samples)\n"
 
     if rx_antennas <= 0 or samples_per_chirp <= 0:
-        for idx, value in enumerate(samples):
-            handle.write(f"  Sample {idx:05d}: {value}\n")
-        handle.write("\n")
+        handle.write(header + _format_linear_dump(samples))
         return
 
     if sample_count % rx_antennas != 0:
         handle.write(
-            "  !! Sample count not divisible by RX antenna count. Dumping linear data.\n"
+            header
+            + "  !! Sample count not divisible by RX antenna count. Dumping linear data.\n"
+            + _format_linear_dump(samples)
         )
-        for idx, value in enumerate(samples):
-            handle.write(f"  Sample {idx:05d}: {value}\n")
-        handle.write("\n")
         return
 
     per_antenna = sample_count // rx_antennas
 
     if per_antenna % samples_per_chirp != 0:
-        handle.write("  !! Sample layout mismatch. Dumping linear data.\n")
-        for idx, value in enumerate(samples):
-            handle.write(f"  Sample {idx:05d}: {value}\n")
-        handle.write("\n")
+        handle.write(
+            header
+            + "  !! Sample layout mismatch. Dumping linear data.\n"
+            + _format_linear_dump(samples)
+        )
         return
 
     chirps = per_antenna // samples_per_chirp
-    cursor = 0
-
-    for chirp in range(chirps):
-        handle.write(f"  Chirp {chirp:03d}:\n")
-        for sample_idx in range(samples_per_chirp):
-            row = samples[cursor : cursor + rx_antennas]
-            cursor += rx_antennas
-            joined = ", ".join(str(num) for num in row)
-            handle.write(f"    Sample {sample_idx:03d}: [{joined}]\n")
-        handle.write("\n")
-
-    handle.write("\n")
+    cube = samples.reshape(chirps, samples_per_chirp, rx_antennas)
+    parts = [header]
+
+    for chirp, chirp_rows in enumerate(cube.tolist()):
+        parts.append(f"  Chirp {chirp:03d}:\n")
+        for sample_idx, row in enumerate(chirp_rows):
+            joined = ", ".join(map(str, row))
+            parts.append(f"    Sample {sample_idx:03d}: [{joined}]\n")
+        parts.append("\n")
+
+    parts.append("\n")
+    handle.write("".join(parts))
+
+
+class _CsvFrameWriter:
+    """Write decoded frames as CSV rows, formatting the index columns once per layout."""
+
+    def __init__(self, handle: TextIO) -> None:
+        self.handle = handle
+        self._parts: list[str] = []
+        self._shape: Optional[tuple[int, ...]] = None
+
+    def write_header(self) -> None:
+        self.handle.write(",".join(CSV_HEADER) + CSV_NEWLINE)
+
+    def writerows(self, rows: Iterable[tuple[int, int, int, int, int]]) -> None:
+        """Write integer rows, joining up to CSV_FLUSH_ROWS of them per write."""
+
+        pending = []
+        for frame, chirp, sample, rx, value in rows:
+            pending.append(f"{frame},{chirp},{sample},{rx},{value}{CSV_NEWLINE}")
+            if len(pending) >= CSV_FLUSH_ROWS:
+                self.handle.write("".join(pending))
+                pending.clear()
+        if pending:
+            self.handle.write("".join(pending))
+
+    def write_cube(self, frame_index: int, cube: np.ndarray) -> None:
+        """Write one (chirps, samples_per_chirp, rx_antennas) frame."""
+
+        rows = cube.size
+        if cube.shape != self._shape:
+            # Each row is frame, "chirp,sample,rx,", value, newline. Only the frame and
+            # value slots change between frames, so the rest is formatted once per layout.
+            self._parts = [CSV_NEWLINE] * (4 * rows)
+            self._parts[1::4] = [
+                f"{chirp},{sample},{rx}," for chirp, sample, rx in np.ndindex(cube.shape)
+            ]
+            self._shape = cube.shape
+
+        parts = self._parts
+        parts[0::4] = [f"{frame_index},"] * rows
+        parts[2::4] = map(str, cube.ravel().tolist())
+        self.handle.write("".join(parts))
+
+
+def _write_linear_csv(csv_writer: _CsvFrameWriter, frame_index: int, samples: np.ndarray) -> None:
+    csv_writer.writerows(
+        (frame_index, idx, 0, 0, value) for idx, value in enumerate(samples.tolist())
+    )
 
 
 def _maybe_write_csv(
-    csv_writer: Optional[Any],
+    csv_writer: Optional[_CsvFrameWriter],
     frame_index: int,
-    samples: Sequence[int],
+    samples: np.ndarray,
     rx_antennas: int,
     samples_per_chirp: int,
 ) -> None:
@@ -106,41 +163,41 @@ def _maybe_write_csv(
 
     sample_count = len(samples)
     if rx_antennas <= 0 or samples_per_chirp <= 0:
-        for idx, value in enumerate(samples):
-            csv_writer.writerow((frame_index, idx, 0, 0, value))
+        _write_linear_csv(csv_writer, frame_index, samples)
         return
 
     if sample_count % rx_antennas != 0:
-        for idx, value in enumerate(samples):
-            csv_writer.writerow((frame_index, idx, 0, 0, value))
+        _write_linear_csv(csv_writer, frame_index, samples)
         return
 
     per_antenna = sample_count // rx_antennas
     if per_antenna % samples_per_chirp != 0:
-        for idx, value in enumerate(samples):
-            csv_writer.writerow((frame_index, idx, 0, 0, value))
+        _write_linear_csv(csv_writer, frame_index, samples)
         return
 
     chirps = per_antenna // samples_per_chirp
-    cursor = 0
+    csv_writer.write_cube(frame_index, samples.reshape(chirps, samples_per_chirp, rx_antennas))
 
-    for chirp in range(chirps):
-        for sample_idx in range(samples_per_chirp):
-            for rx in range(rx_antennas):
-                csv_writer.writerow((frame_index, chirp, sample_idx, rx, samples[cursor + rx]))
-            cursor += rx_antennas
 
+def _iter_frames(stream) -> Iterable[tuple[int, int, int, int, memoryview]]:
+    """Yield frame headers together with a view of each payload.
+
+    The payload view aliases a buffer that is refilled for the next frame, so
+    callers must be done with it (or copy it) before advancing the iterator.
+    """
+
+    header_buf = bytearray(HEADER_STRUCT.size)
+    payload_buf = bytearray()
 
-def _iter_frames(stream) -> Iterable[tuple[int, int, int, int, bytes]]:
     while True:
-        header_bytes = stream.read(HEADER_STRUCT.size)
-        if not header_bytes:
+        header_read = stream.readinto(header_buf)
+        if not header_read:
             break
-        if len(header_bytes) != HEADER_STRUCT.size:
+        if header_read != HEADER_STRUCT.size:
             raise FrameDecodeError("Trailing bytes detected while reading header")
 
-        magic, version, sample_size, frame_index, sample_count = HEADER_STRUCT.unpack(
-            header_bytes
+        magic, version, sample_size, frame_index, sample_count = HEADER_STRUCT.unpack_from(
+            header_buf
         )
 
         if magic != HEADER_MAGIC:
@@ -150,8 +207,13 @@ def _iter_frames(stream) -> Iterable[tuple[int, int, int, int, bytes]]:
                 f"Unsupported header version {version}; expected {SUPPORTED_VERSION}"
             )
 
-        payload = _read_exact(stream, sample_size * sample_count)
-        yield frame_index, sample_size, sample_count, len(payload), payload
+        payload_size = sample_size * sample_count
+        if len(payload_buf) < payload_size:
+            payload_buf = bytearray(payload_size)
+
+        payload = memoryview(payload_buf)[:payload_size]
+        _read_exact_into(stream, payload)
+        yield frame_index, sample_size, sample_count, payload_size, payload
 
 
 def decode_frames(
@@ -172,14 +234,23 @@ def decode_frames(
         "samples": 0,
     }
 
-    text_handle = open(output_text, "w", encoding="utf-8") if output_text else None
-    csv_handle = open(output_csv, "w", encoding="utf-8", newline="") if output_csv else None
+    text_handle = (
+        open(output_text, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE)
+        if output_text
+        else None
+    )
+    csv_handle = (
+        open(output_csv, "w", encoding="utf-8", newline="", buffering=OUTPUT_BUFFER_SIZE)
+        if output_csv
+        else None
+    )
+
     csv_writer = None
 
     try:
         if csv_handle:
-            csv_writer = csv.writer(csv_handle)
-            csv_writer.writerow(("frame", "chirp", "sample", "rx", "value"))
+            csv_writer = _CsvFrameWriter(csv_handle)
+            csv_writer.write_header()
 
         with input_path.open("rb") as stream:
             for frame_idx, sample_size, sample_count, payload_size, payload in _iter_frames(stream):
@@ -4,10 +4,10 @@
 import argparse
 import struct
 import sys
-import time
 from contextlib import nullcontext
-from typing import Optional, Sequence
+from typing import Optional
 
+import numpy as np
 import serial
 
 
@@ -15,6 +15,8 @@ HEADER_STRUCT = struct.Struct("<4sHHII")
 HEADER_MAGIC = b"RADR"
 HEADER_SIZE = HEADER_STRUCT.size
 SUPPORTED_HEADER_VERSION = 1
+OUTPUT_BUFFER_SIZE = 1 << 20
+SAMPLE_DTYPES = {1: np.dtype("<u1"), 2: np.dtype("<u2"), 4: np.dtype("<u4")}
 
 
 def _build_start_command(frames: Optional[int]) -> bytes:
@@ -29,19 +31,21 @@ def _align_stream(port: serial.Serial) -> tuple[str, bytearray]:
 
     status_bytes = bytearray()
     buffer = bytearray()
+    # Bytes kept between reads so a magic split across two chunks is still found.
+    carry = len(HEADER_MAGIC) - 1
 
     while True:
+        # Blocks for up to the port timeout, so an idle line does not spin.
         chunk = port.read(1024)
         if not chunk:
-            time.sleep(0.005)
             continue
 
         buffer.extend(chunk)
         magic_idx = buffer.find(HEADER_MAGIC)
 
         if magic_idx == -1:
-            status_bytes.extend(buffer)
-            buffer.clear()
+            status_bytes.extend(buffer[:-carry])
+            del buffer[:-carry]
             continue
 
         status_bytes.extend(buffer[:magic_idx])
@@ -54,78 +58,76 @@ def _fill_buffer(port: serial.Serial, buffer: bytearray, target_size: int) -> No
     """Ensure buffer has at least target_size bytes by reading from the port."""
 
     while len(buffer) < target_size:
-        chunk = port.read(target_size - len(buffer))
-
-        if chunk:
-            buffer.extend(chunk)
-            continue
-
-        time.sleep(0.005)
+        # An empty read just means the port timeout expired; try again.
+        buffer.extend(port.read(target_size - len(buffer)))
 
 
-def _unpack_samples(payload: bytes, sample_count: int, sample_size: int) -> Sequence[int]:
+def _unpack_samples(payload: bytes, sample_count: int, sample_size: int) -> np.ndarray:
     if len(payload) != sample_count * sample_size:
         raise RuntimeError("Payload size does not match header metadata.")
 
-    if sample_size == 2:
-        return struct.unpack(f"<{sample_count}H", payload)
-    if sample_size == 1:
-        return struct.unpack(f"<{sample_count}B", payload)
-    if sample_size == 4:
-        return struct.unpack(f"<{sample_count}I", payload)
+    dtype = SAMPLE_DTYPES.get(sample_size)
+    if dtype is None:
+        raise RuntimeError(f"Unsupported sample size: {sample_size} bytes")
 
-    raise RuntimeError(f"Unsupported sample size: {sample_size} bytes")
+    return np.frombuffer(payload, dtype=dtype)
+
+
+def _format_linear_dump(samples: np.ndarray) -> str:
+    lines = [f"  Sample {i:05d}: {value}\n" for i, value in enumerate(samples.tolist())]
+    lines.append("\n")
+    return "".join(lines)
 
 
 def _write_formatted_frame(
     handle,
     *,
     frame_index: int,
-    samples: Sequence[int],
+    samples: np.ndarray,
     rx_antennas: int,
     samples_per_chirp: int,
 ) -> None:
     sample_count = len(samples)
-    handle.write(f"Frame {frame_index} ({sample_count} samples)\n")
+    header = f"Frame {frame_index} ({sample_count} samples)\n"
 
     if rx_antennas <= 0 or samples_per_chirp <= 0:
         # Fall back to a simple linear dump.
-        for i, value in enumerate(samples):
-            handle.write(f"  Sample {i:05d}: {value}\n")
-        handle.write("\n")
+        handle.write(header + _format_linear_dump(samples))
         return
 
     if sample_count % rx_antennas != 0:
-        handle.write("  !! Sample count not divisible by RX antenna count. Dumping linear data.\n")
-        for i, value in enumerate(samples):
-            handle.write(f"  Sample {i:05d}: {value}\n")
-        handle.write("\n")
+        handle.write(
+            header
+            + "  !! Sample count not divisible by RX antenna count. Dumping linear data.\n"
+            + _format_linear_dump(samples)
+        )
         return
 
     samples_per_frame = sample_count // rx_antennas
 
     if samples_per_frame % samples_per_chirp != 0:
-        handle.write("  !! Sample layout mismatch. Dumping linear data.\n")
-        for i, value in enumerate(samples):
-            handle.write(f"  Sample {i:05d}: {value}\n")
-        handle.write("\n")
+        handle.write(
+            header
+            + "  !! Sample layout mismatch. Dumping linear data.\n"
+            + _format_linear_dump(samples)
+        )
         return
 
     chirps = samples_per_frame // samples_per_chirp
-    idx = 0
+    cube = samples.reshape(chirps, samples_per_chirp, rx_antennas)
+    parts = [header]
 
-    for chirp in range(chirps):
-        handle.write(f"  Chirp {chirp:03d}:\n")
+    for chirp, chirp_rows in enumerate(cube.tolist()):
+        parts.append(f"  Chirp {chirp:03d}:\n")
 
-        for sample_idx in range(samples_per_chirp):
-            row = samples[idx: idx + rx_antennas]
-            idx += rx_antennas
-            values = ", ".join(str(value) for value in row)
-            handle.write(f"    Sample {sample_idx:03d}: [{values}]\n")
+        for sample_idx, row in enumerate(chirp_rows):
+            values = ", ".join(map(str, row))
+            parts.append(f"    Sample {sample_idx:03d}: [{values}]\n")
 
-        handle.write("\n")
+        parts.append("\n")
 
-    handle.write("\n")
+    parts.append("\n")
+    handle.write("".join(parts))
 
 
 def main() -> int:
@@ -157,7 +159,7 @@ def main() -> int:
         "--timeout",
         type=float,
         default=0.1,
-        help="Serial read timeout in seconds (default: 0.1).",
+        help="Serial read timeout in seconds; must be positive (default: 0.1).",
     )
     parser.add_argument(
         "--formatted-output",
@@ -185,14 +187,18 @@ def main() -> int:
     if args.frames is not None and args.frames < 0:
         parser.error("--frames must be >= 0")
 
+    if args.timeout <= 0:
+        parser.error("--timeout must be > 0")
+
     frames_arg = None if args.frames in (None, 0) else args.frames
     start_command = _build_start_command(frames_arg)
     stop_command = b"stop\r\n"
 
     try:
         with serial.Serial(args.port, baudrate=args.baud, timeout=args.timeout) as ser, \
-                open(args.output, "wb") as outfile, \
-                (open(args.formatted_output, "w", encoding="utf-8") if args.formatted_output else nullcontext()) as formatted:
+                open(args.output, "wb", buffering=OUTPUT_BUFFER_SIZE) as outfile, \
+                (open(args.formatted_output, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE)
+                 if args.formatted_output else nullcontext()) as formatted:
 
             ser.reset_input_buffer()
             ser.reset_output_buffer()
@@ -218,27 +224,12 @@ def main() -> int:
             pending_frames = frames_arg
             frames_captured = 0
 
-            pending_header = None
-
-            if len(buffer) >= HEADER_SIZE:
-                pending_header = bytes(buffer[:HEADER_SIZE])
-                del buffer[:HEADER_SIZE]
-            else:
-                _fill_buffer(ser, buffer, HEADER_SIZE)
-                pending_header = bytes(buffer[:HEADER_SIZE])
-                del buffer[:HEADER_SIZE]
-
             try:
                 while pending_frames is None or pending_frames > 0:
-                    if pending_header is not None:
-                        header_bytes = pending_header
-                        pending_header = None
-                    else:
-                        _fill_buffer(ser, buffer, HEADER_SIZE)
-                        header_bytes = bytes(buffer[:HEADER_SIZE])
-                        del buffer[:HEADER_SIZE]
-
-                    magic, version, sample_size, frame_index, sample_count = HEADER_STRUCT.unpack(header_bytes)
+                    # Header and payload are kept together at the front of buffer
+                    # until the whole frame has been written out.
+                    _fill_buffer(ser, buffer, HEADER_SIZE)
+                    magic, version, sample_size, frame_index, sample_count = HEADER_STRUCT.unpack_from(buffer)
 
                     if magic != HEADER_MAGIC:
                         raise RuntimeError("Stream out of sync: header magic mismatch.")
@@ -248,14 +239,11 @@ def main() -> int:
                             f"Unsupported header version {version}; expected {SUPPORTED_HEADER_VERSION}."
                         )
 
-                    payload_size = sample_count * sample_size
-                    _fill_buffer(ser, buffer, payload_size)
-                    payload = bytes(buffer[:payload_size])
-                    del buffer[:payload_size]
+                    frame_size = HEADER_SIZE + sample_count * sample_size
+                    _fill_buffer(ser, buffer, frame_size)
 
-                    outfile.write(header_bytes)
-                    outfile.write(payload)
-                    outfile.flush()
+                    with memoryview(buffer) as frame_view:
+                        outfile.write(frame_view[:frame_size])
 
                     frames_captured += 1
                     if pending_frames is not None:
@@ -267,7 +255,7 @@ def main() -> int:
                     sys.stderr.flush()
 
                     if formatted:
-                        samples = _unpack_samples(payload, sample_count, sample_size)
+                        samples = _unpack_samples(buffer[HEADER_SIZE:frame_size], sample_count, sample_size)
                         _write_formatted_frame(
                             formatted,
                             frame_index=frame_index,
@@ -275,11 +263,18 @@ def main() -> int:
                             rx_antennas=args.rx_antennas,
                             samples_per_chirp=args.samples_per_chirp,
                         )
-                        formatted.flush()
+
+                    del buffer[:frame_size]
 
             except KeyboardInterrupt:
                 sys.stderr.write("Capture interrupted by user.\n")
             finally:
+                # Frames are only buffered in memory until here; make sure an
+                # interrupted capture still lands on disk.
+                outfile.flush()
+                if formatted:
+                    formatted.flush()
+
                 if args.stop_on_exit:
                     try:
                         ser.write(stop_command)
@@ -1,8 +1,10 @@
 """Utilities for rewriting radar capture logs into a compact hierarchy."""
 
 import argparse
+import io
+import itertools
+import os
 import re
-from collections import defaultdict
 
 
 FRAME_HEADER_RE = re.compile(r'=+\s*Frame\s+(\d+)[^=]*=+')
@@ -11,6 +13,7 @@ OLD_RX_SPLIT_RE = re.compile(r'---\s*RX Antenna\s*(\d+)\s*---')
 OLD_CHIRP_RE = re.compile(r'Chirp\s+(\d+):\s+([\d\s]+?)(?=Chirp|$)', re.DOTALL)
 CHIRP_LINE_RE = re.compile(r'^Chirp\s+(\d+):')
 SAMPLE_LINE_RE = re.compile(r'^Sample\s+(\d+):\s*\[([^\]]+)\]')
+FORMAT_PEEK_SIZE = 4096
 
 
 def parse_old_format(content):
@@ -19,97 +22,171 @@ def parse_old_format(content):
     for idx in range(1, len(parts), 2):
         frame_num = int(parts[idx])
         frame_body = parts[idx + 1] if idx + 1 < len(parts) else ""
-        frame_entry = {1: {}, 2: {}, 3: {}}
+        rx_samples = {1: {}, 2: {}, 3: {}}
         rx_sections = re.split(OLD_RX_SPLIT_RE, frame_body)
         for rx_idx in range(1, len(rx_sections), 2):
-            rx_num = int(rx_sections[rx_idx])
+            chirps = rx_samples.setdefault(int(rx_sections[rx_idx]), {})
             rx_body = rx_sections[rx_idx + 1] if rx_idx + 1 < len(rx_sections) else ""
             for match in re.finditer(OLD_CHIRP_RE, rx_body):
-                chirp_num = int(match.group(1))
-                values = match.group(2).strip().split()
-                frame_entry.setdefault(rx_num, {})[chirp_num] = values
-        frames[frame_num] = frame_entry
-    return frames
-
-
-def parse_new_format(content):
-    frames = defaultdict(lambda: {1: defaultdict(list), 2: defaultdict(list), 3: defaultdict(list)})
-    current_frame = None
-    current_chirp = None
-
-    for raw_line in content.splitlines():
+                chirps[int(match.group(1))] = match.group(2).strip().split()
+        frames[frame_num] = rx_samples
+    return sorted(frames.items())
+
+
+def _frame_number(line):
+    body = line.lstrip('=').lstrip()
+    if body.startswith('Frame '):
+        fields = body[6:].split(maxsplit=1)
+        if len(fields) == 2 and fields[0].isdecimal() and '=' in fields[1]:
+            return int(fields[0])
+    match = FRAME_HEADER_RE.match(line)
+    return int(match.group(1)) if match else None
+
+
+def _chirp_number(line):
+    if line.startswith('Chirp '):
+        number, colon, _ = line[6:].partition(':')
+        if colon and number.isdecimal():
+            return int(number)
+    match = CHIRP_LINE_RE.match(line)
+    return int(match.group(1)) if match else None
+
+
+def _sample_values_segment(line):
+    if line.startswith('Sample '):
+        number, bracket, rest = line[7:].partition(': [')
+        end = rest.find(']')
+        if bracket and number.isdecimal() and end > 0:
+            return rest[:end]
+    match = SAMPLE_LINE_RE.match(line)
+    return match.group(2) if match else None
+
+
+class NewFormatParser:
+    """Incrementally parse the sample-per-line log format one frame at a time.
+
+    A frame is held as ``rx_samples[rx][chirp]`` lists of sample strings, keyed
+    by the numbers seen in the log so sparse or large chirp numbers stay cheap.
+    """
+
+    def __init__(self):
+        self.current_frame = None
+        self.current_lists = None
+        self.rx_samples = None
+
+    def _take_frame(self):
+        if self.rx_samples is None:
+            return None
+        frame = (self.current_frame, self.rx_samples)
+        self.rx_samples = None
+        return frame
+
+    def _start_chirp(self, chirp_num):
+        if self.rx_samples is None:
+            self.rx_samples = {1: {}, 2: {}, 3: {}}
+        self.current_lists = tuple(
+            chirps.setdefault(chirp_num, []) for chirps in self.rx_samples.values()
+        )
+
+    def feed(self, raw_line):
+        """Consume one line and return a completed ``(frame_num, rx_samples)`` pair, if any."""
         line = raw_line.strip()
         if not line:
-            continue
-        if ']' in line:
-            line = line.split(']', 1)[1].strip()
+            return None
+        _, bracket, rest = line.partition(']')
+        if bracket:
+            line = rest.strip()
             if not line:
-                continue
-
-        frame_match = FRAME_HEADER_RE.match(line)
-        if frame_match:
-            current_frame = int(frame_match.group(1))
-            current_chirp = None
-            continue
-
-        if current_frame is None:
-            continue
-
-        chirp_match = CHIRP_LINE_RE.match(line)
-        if chirp_match:
-            current_chirp = int(chirp_match.group(1))
-            # ensure containers exist for this chirp
-            frame_data = frames[current_frame]
-            for rx in (1, 2, 3):
-                frame_data[rx][current_chirp] = frame_data[rx][current_chirp]
-            continue
-
-        sample_match = SAMPLE_LINE_RE.match(line)
-        if sample_match and current_chirp is not None:
-            values_segment = sample_match.group(2)
-            values = [value.strip() for value in values_segment.split(',') if value.strip()]
+                return None
+
+        first = line[0]
+        if first == '=':
+            frame_num = _frame_number(line)
+            if frame_num is not None:
+                completed = self._take_frame()
+                self.current_frame = frame_num
+                self.current_lists = None
+                return completed
+
+        if self.current_frame is None:
+            return None
+
+        if first == 'C':
+            chirp_num = _chirp_number(line)
+            if chirp_num is not None:
+                self._start_chirp(chirp_num)
+                return None
+
+        if first == 'S' and self.current_lists is not None:
+            values_segment = _sample_values_segment(line)
+            if values_segment is None:
+                return None
+            values = [value for value in map(str.strip, values_segment.split(',')) if value]
             if len(values) == 3:
-                frame_data = frames[current_frame]
-                frame_data[1][current_chirp].append(values[0])
-                frame_data[2][current_chirp].append(values[1])
-                frame_data[3][current_chirp].append(values[2])
-
-    # convert nested defaultdicts to plain dicts
-    normalized_frames = {}
-    for frame_num, rx_map in frames.items():
-        normalized_frames[frame_num] = {
-            rx_num: dict(chirp_map) for rx_num, chirp_map in rx_map.items()
-        }
-    return normalized_frames
-
-
-def write_frames(frames, output_file):
-    with open(output_file, 'w', encoding='utf-8') as out:
-        for frame_num in sorted(frames):
-            out.write(f"[Frame {frame_num}:]\n")
-            frame_data = frames[frame_num]
-            for rx_num in sorted(frame_data):
-                chirps = frame_data[rx_num]
-                if not chirps:
-                    continue
-                out.write(f"RX{rx_num}:\n")
-                for chirp_num in sorted(chirps):
-                    values = ' '.join(str(value) for value in chirps[chirp_num])
-                    out.write(f"  Chirp{chirp_num}: {values}\n")
-                out.write("\n")
-            out.write("\n")
+                rx1, rx2, rx3 = self.current_lists
+                rx1.append(values[0])
+                rx2.append(values[1])
+                rx3.append(values[2])
+        return None
+
+    def finish(self):
+        """Return the last buffered frame, if any."""
+        return self._take_frame()
+
+
+def emit_new_format(lines, out):
+    """Write each frame of the sample-per-line format as soon as it is complete."""
+    parser = NewFormatParser()
+    for raw_line in lines:
+        frame = parser.feed(raw_line)
+        if frame is not None:
+            write_frame(out, *frame)
+    frame = parser.finish()
+    if frame is not None:
+        write_frame(out, *frame)
+
+
+def write_frame(out, frame_num, rx_samples):
+    parts = [f"[Frame {frame_num}:]\n"]
+    for rx_num in sorted(rx_samples):
+        chirps = rx_samples[rx_num]
+        if not chirps:
+            continue
+        parts.append(f"RX{rx_num}:\n")
+        for chirp_num in sorted(chirps):
+            parts.append(f"  Chirp{chirp_num}: {' '.join(chirps[chirp_num])}\n")
+        parts.append("\n")
+    parts.append("\n")
+    out.write(''.join(parts))
 
 
 def parse_radar_data(input_file, output_file):
-    with open(input_file, 'r', encoding='utf-8') as src:
-        content = src.read()
-
-    if 'Sample' in content:
-        frames = parse_new_format(content)
-    else:
-        frames = parse_old_format(content)
-
-    write_frames(frames, output_file)
+    # Write beside the destination and move it into place once both files are
+    # closed, so an input that is also the output is never truncated mid-read
+    # and a failed run leaves no partial output behind.
+    tmp_file = f"{output_file}.{os.getpid()}.tmp"
+    created = False
+    try:
+        with open(input_file, 'r', encoding='utf-8') as src:
+            with open(tmp_file, 'x', encoding='utf-8') as out:
+                created = True
+                head = src.read(FORMAT_PEEK_SIZE)
+                if 'Sample' in head:
+                    # Finish the peeked line, then keep reading lazily from the file.
+                    emit_new_format(itertools.chain(io.StringIO(head + src.readline()), src), out)
+                else:
+                    content = head + src.read()
+                    if 'Sample' in content:
+                        emit_new_format(content.splitlines(), out)
+                    else:
+                        for frame_num, rx_samples in parse_old_format(content):
+                            write_frame(out, frame_num, rx_samples)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        # Never remove a file this run did not create, e.g. another run's temp file.
+        if created:
+            os.remove(tmp_file)
+        raise
 
 
 def main():